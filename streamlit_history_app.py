@@ -5,16 +5,24 @@ Shows current brief and allows browsing through the last 7 days of briefs.
 """
 
 import streamlit as st
+import sys
 import json
 import html
 import os
+import re
 import requests
+from collections import Counter
+from functools import lru_cache
 from datetime import datetime, timedelta
-import pytz
-from typing import Dict, List
-import glob
+from zoneinfo import ZoneInfo
+from typing import Dict, List, Tuple
 from urllib.parse import urlparse
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib parser
+    orjson = None
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="Daily Tech & Security Brief - History",
@@ -24,7 +32,7 @@ st.set_page_config(
 )
 
 # Dark theme CSS
-st.markdown("""
+DARK_THEME_CSS = """
 <style>
     .stApp {
         background-color: #0e1117;
@@ -170,136 +178,333 @@ st.markdown("""
         color: #e3f2fd;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Re-emitted on every rerun on purpose: Streamlit drops elements that a rerun
+# does not write again, so a once-per-session guard would lose the theme.
+st.markdown(DARK_THEME_CSS, unsafe_allow_html=True)
+
+# Severity presentation, keyed by score (5 = most severe, 0 = unscored)
+SEVERITY_COLORS = {5: '#d32f2f', 4: '#f57c00', 3: '#fbc02d', 2: '#42a5f5', 1: '#90a4ae'}
+SEVERITY_LABELS = {5: 'CRITICAL', 4: 'HIGH', 3: 'MEDIUM', 2: 'LOW', 1: 'INFO', 0: 'UNSCORED'}
+SEVERITY_NAMES = {5: 'Critical', 4: 'High', 3: 'Medium', 2: 'Low', 1: 'Info'}
+SEVERITY_DISPLAY = {
+    5: '🔴 CRITICAL',
+    4: '🟠 HIGH',
+    3: '🟡 MEDIUM',
+    2: '🔵 LOW',
+    1: '⚪ INFO',
+    0: '⚫ UNSCORED'
+}
+
+_SGT = ZoneInfo('Asia/Singapore')
+
+_MONTH_NAMES = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+)
+
+# fromisoformat accepts a trailing 'Z' from Python 3.11 onwards
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(timestamp: str) -> datetime:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+# Netloc of an http(s) URL, same as urlparse(url).netloc for these URLs
+_HTTP_NETLOC_RE = re.compile(r'https?://([^/?#\s]*)(?=[/?#]|$)')
+
+# Story cards rendered per "Load more" page
+STORIES_PAGE_SIZE = 20
+
+# Filename date validation - regex + datetime() is much cheaper than datetime.strptime
+_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})', re.ASCII)
+
+def _is_valid_date(date_str: str) -> bool:
+    """Check that a string is a real YYYY-MM-DD calendar date"""
+    match = _DATE_RE.fullmatch(date_str)
+    if not match:
+        return False
+    try:
+        datetime(int(match[1]), int(match[2]), int(match[3]))
+    except ValueError:
+        return False
+    return True
+
+def _scan_history(history_dir: str) -> Dict[str, Tuple[str, int]]:
+    """Map each history date to (path, mtime_ns) in a single directory pass"""
+    files = {}
+    
+    with os.scandir(history_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            # Filename format: tech_brief_2025-09-30.json
+            if name.startswith('tech_brief_') and name.endswith('.json'):
+                date_str = name[len('tech_brief_'):-len('.json')]
+                if _is_valid_date(date_str):
+                    files[date_str] = (entry.path, entry.stat().st_mtime_ns)
+    
+    return files
+
+# lru_cache rather than st.cache_data: the latter pickles a copy of the brief
+# on every hit, which costs more than re-parsing. Callers must treat the
+# returned dict as read-only, since it is shared between reruns
+@lru_cache(maxsize=16)
+def _load_json(path: str, mtime_ns: int) -> Dict:
+    """Parse a brief file (mtime_ns is only a cache key - it changes when the file is rewritten)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+# In memory only: every rewrite of a file changes the mtime key, and Streamlit
+# never deletes persisted entries, so a disk cache would grow without bound
+@st.cache_data(show_spinner=False, max_entries=8)
+def _trend_data(files: Tuple[Tuple[str, str, int], ...]) -> List[Dict]:
+    """Aggregate per-day totals, category and severity counts from (date, path, mtime_ns) tuples"""
+    trend_data = []
+    for d_str, path, mtime_ns in files:
+        try:
+            hist = _load_json(path, mtime_ns)
+        except Exception:
+            continue
+        if not hist:
+            continue
+        hist_stories = hist.get('stories', [])
+        cat_counts_hist = dict(Counter(s.get('category', 'Other') for s in hist_stories))
+        sev_counted = Counter(s.get('severity', 3) for s in hist_stories)
+        sev_counts_hist = {sev: sev_counted[sev] for sev in (5, 4, 3, 2, 1)}
+        trend_data.append({
+            'date': d_str,
+            'total': len(hist_stories),
+            'categories': cat_counts_hist,
+            'severity': sev_counts_hist
+        })
+    return trend_data
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _trend_figures(trend_data: List[Dict]) -> list:
+    """Build the trend charts. Cached as resources so unchanged trend data reuses the same Figure objects"""
+    if not trend_data:
+        return []
+
+    import plotly.graph_objects as go
+
+    figures = []
+    dates = [t['date'] for t in trend_data]
+    totals = [t['total'] for t in trend_data]
+
+    # Total stories over time
+    fig_total = go.Figure()
+    fig_total.add_trace(go.Scatter(
+        x=dates, y=totals, mode='lines+markers',
+        line=dict(color='#64b5f6', width=3),
+        marker=dict(size=8), name='Total Stories'
+    ))
+    fig_total.update_layout(
+        title='Daily Story Volume', height=300,
+        paper_bgcolor='#0e1117', plot_bgcolor='#1a1a2e',
+        font_color='#e0e0e0', xaxis_title='', yaxis_title='Stories',
+        margin=dict(l=40, r=20, t=40, b=30)
+    )
+    figures.append(fig_total)
+
+    # Category breakdown over time (top 6)
+    all_cats_trend = set()
+    for t in trend_data:
+        all_cats_trend.update(t['categories'].keys())
+    cat_totals = {c: sum(t['categories'].get(c, 0) for t in trend_data) for c in all_cats_trend}
+    top_cats = sorted(cat_totals, key=lambda c: cat_totals[c], reverse=True)[:6]
+
+    cat_colors = ['#d32f2f', '#f57c00', '#fbc02d', '#42a5f5', '#66bb6a', '#ab47bc']
+    fig_cats = go.Figure()
+    for i, cat in enumerate(top_cats):
+        vals = [t['categories'].get(cat, 0) for t in trend_data]
+        fig_cats.add_trace(go.Bar(
+            x=dates, y=vals, name=cat,
+            marker_color=cat_colors[i % len(cat_colors)]
+        ))
+    fig_cats.update_layout(
+        title='Top Categories Over Time', barmode='stack', height=350,
+        paper_bgcolor='#0e1117', plot_bgcolor='#1a1a2e',
+        font_color='#e0e0e0', xaxis_title='', yaxis_title='Stories',
+        margin=dict(l=40, r=20, t=40, b=30),
+        legend=dict(orientation='h', y=-0.2)
+    )
+    figures.append(fig_cats)
+
+    # Severity distribution over time
+    any_sev = any(t['severity'].get(5, 0) + t['severity'].get(4, 0) > 0 for t in trend_data)
+    if any_sev:
+        fig_sev = go.Figure()
+        for sev in [5, 4, 3, 2, 1]:
+            vals = [t['severity'].get(sev, 0) for t in trend_data]
+            if any(v > 0 for v in vals):
+                fig_sev.add_trace(go.Bar(
+                    x=dates, y=vals, name=SEVERITY_NAMES[sev],
+                    marker_color=SEVERITY_COLORS[sev]
+                ))
+        fig_sev.update_layout(
+            title='Severity Distribution Over Time', barmode='stack', height=300,
+            paper_bgcolor='#0e1117', plot_bgcolor='#1a1a2e',
+            font_color='#e0e0e0', xaxis_title='', yaxis_title='Stories',
+            margin=dict(l=40, r=20, t=40, b=30),
+            legend=dict(orientation='h', y=-0.2)
+        )
+        figures.append(fig_sev)
+
+    return figures
+
+def _format_singapore_time(timestamp: str, short_format: bool = False) -> str:
+    """Format timestamp to Singapore timezone"""
+    # Non-strings (and unhashable values) never reach the cache; they are
+    # returned unchanged, like anything else that does not parse
+    if not isinstance(timestamp, str) or 'T' not in timestamp:
+        return timestamp
+    return _format_iso_singapore_time(timestamp, short_format)
+
+@lru_cache(maxsize=4096)
+def _format_iso_singapore_time(timestamp: str, short_format: bool) -> str:
+    """Format an ISO timestamp string in Singapore time"""
+    try:
+        dt = _parse_iso(timestamp)
+        singapore_time = dt.astimezone(_SGT)
+
+        month = _MONTH_NAMES[singapore_time.month - 1]
+        clock = f"{singapore_time.hour:02d}:{singapore_time.minute:02d}"
+        
+        if short_format:
+            # Short format for metrics: "Sep 30, 15:30 SGT"
+            return f"{month[:3]} {singapore_time.day:02d}, {clock} SGT"
+        else:
+            # Full format for story cards: "September 30, 2025 15:30 SGT"
+            return f"{month} {singapore_time.day:02d}, {singapore_time.year} {clock} SGT"
+    except:
+        return timestamp
+
+@lru_cache(maxsize=1024)
+def _extract_domain(url: str) -> str:
+    """Extract clean domain name from URL"""
+    try:
+        # Fast path for plain http(s) URLs; anything unusual goes through urlparse
+        match = _HTTP_NETLOC_RE.match(url)
+        domain = match.group(1) if match else urlparse(url).netloc
+        # Remove 'www.' prefix if present
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        return domain
+    except:
+        return "Unknown source"
+
+def _story_card_html(story: Dict) -> str:
+    """Build the HTML for a story card"""
+    get = story.get
+    companies = get('companies', [])
+    if isinstance(companies, str):
+        companies = companies.split(',') if companies else []
+    
+    # Format published date
+    pub_date = get('published_date', '')
+    formatted_date = _format_singapore_time(pub_date) if pub_date else 'Date not available'
+    
+    # Extract website domain
+    url_raw = get('url', '#')
+    website = _extract_domain(url_raw)
+    
+    # Escape HTML to prevent rendering of tags in content
+    headline = html.escape(get('headline', 'No headline available'))
+    summary = html.escape(get('summary', 'No summary available'))
+    why_matters = html.escape(get('why_matters', 'Analysis not available'))
+    url = html.escape(url_raw)
+    website_escaped = html.escape(website)
+    
+    # Build companies HTML separately
+    companies_html = ''
+    if companies and len(companies) > 0:
+        names = [company.strip() for company in companies[:8]]
+        company_tags = ' '.join([f'<span class="company-tag">{html.escape(name)}</span>' for name in names if name])
+        if company_tags:
+            companies_html = f'<div style="margin-top: 0.5rem;">{company_tags}</div>'
+    
+    severity = get('severity', 0)
+    sev_badge = ''
+    if severity and severity >= 1:
+        sev_badge = f'<span style="background:{SEVERITY_COLORS.get(severity,"#90a4ae")};color:#fff;padding:2px 8px;border-radius:10px;font-size:0.75rem;font-weight:bold;margin-right:8px">{SEVERITY_LABELS.get(severity,"")}</span>'
+        border_color = SEVERITY_COLORS.get(severity, '#64b5f6')
+    else:
+        border_color = '#64b5f6'
+
+    return f"""<div class="story-card" style="border-left-color: {border_color};">
+    <div class="story-headline">
+        {sev_badge}<a href="{url}" target="_blank" style="text-decoration: none; color: #90caf9;">{headline}</a>
+    </div>
+    <div style="color: #b0b0b0; font-size: 0.9rem; margin-bottom: 0.8rem;">
+        📅 {formatted_date} • 🌐 <a href="{url}" target="_blank" style="color: #64b5f6; text-decoration: none;">{website_escaped}</a>
+    </div>
+    <div class="story-summary">{summary}</div>
+    <div class="why-matters"><strong>💡 Why it matters:</strong> {why_matters}</div>{companies_html}
+</div>"""
 
 class HistoryTechBriefApp:
     def __init__(self):
         self.history_dir = "history"
         self.current_file = "tech_brief.json"
         self.webhook_url = "http://localhost:8080"
-        
-    def get_available_dates(self) -> List[str]:
-        """Get available historical dates from local files"""
-        if not os.path.exists(self.history_dir):
-            return []
-        
-        pattern = os.path.join(self.history_dir, "tech_brief_*.json")
-        dates = []
-        
-        for file_path in glob.glob(pattern):
-            filename = os.path.basename(file_path)
+        self._history_files = None
+        
+    def get_history_files(self) -> Dict[str, Tuple[str, int]]:
+        """Get date -> (path, mtime_ns) for the history files, scanned once per script run"""
+        # Not cached across reruns: a directory-mtime key would miss files edited
+        # in place (by hand or by other tools), which change only the file's mtime,
+        # and coarse directory timestamps can hide two updates in the same tick.
+        # The per-file mtimes from this scan are what key the load caches
+        if self._history_files is None:
             try:
-                date_str = filename.replace('tech_brief_', '').replace('.json', '')
-                # Validate date format
-                datetime.strptime(date_str, '%Y-%m-%d')
-                dates.append(date_str)
-            except:
-                continue
-        
-        # Sort dates in descending order (newest first)
-        dates.sort(reverse=True)
-        return dates
+                self._history_files = _scan_history(self.history_dir)
+            except OSError:
+                self._history_files = {}
+        return self._history_files
+    
+    def get_available_dates(self) -> List[str]:
+        """Get available historical dates from local files (newest first)"""
+        return sorted(self.get_history_files(), reverse=True)
     
     def load_data_for_date(self, date: str = None) -> Dict:
         """Load data for specific date or current data"""
+        if date:
+            # Load historical data - path and mtime come from the directory scan
+            history_file = self.get_history_files().get(date)
+            if not history_file:
+                return {}
+            path, mtime_ns = history_file
+        else:
+            # Load current data
+            path = self.current_file
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                return {}
+        
         try:
-            if date:
-                # Load historical data
-                historical_file = os.path.join(self.history_dir, f"tech_brief_{date}.json")
-                if os.path.exists(historical_file):
-                    with open(historical_file, 'r', encoding='utf-8') as f:
-                        return json.load(f)
-                else:
-                    return {}
-            else:
-                # Load current data
-                if os.path.exists(self.current_file):
-                    with open(self.current_file, 'r', encoding='utf-8') as f:
-                        return json.load(f)
-                else:
-                    return {}
+            return _load_json(path, mtime_ns)
         except Exception as e:
             st.error(f"Error loading data: {e}")
             return {}
     
-    def format_singapore_time(self, timestamp: str, short_format: bool = False) -> str:
-        """Format timestamp to Singapore timezone"""
-        try:
-            if 'T' in timestamp:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                singapore_tz = pytz.timezone('Asia/Singapore')
-                singapore_time = dt.astimezone(singapore_tz)
-                
-                if short_format:
-                    # Short format for metrics: "Sep 30, 15:30 SGT"
-                    return singapore_time.strftime('%b %d, %H:%M SGT')
-                else:
-                    # Full format for story cards: "September 30, 2025 15:30 SGT"
-                    return singapore_time.strftime('%B %d, %Y %H:%M SGT')
-            return timestamp
-        except:
-            return timestamp
+    def get_trend_data(self, dates: List[str]) -> List[Dict]:
+        """Get trend aggregates for the given dates, oldest first (recomputed only when a file changes)"""
+        history_files = self.get_history_files()
+        files = tuple((d_str,) + history_files[d_str] for d_str in sorted(dates) if d_str in history_files)
+        return _trend_data(files)
     
-    def extract_domain(self, url: str) -> str:
-        """Extract clean domain name from URL"""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc
-            # Remove 'www.' prefix if present
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            return domain
-        except:
-            return "Unknown source"
-    
-    def render_story_card(self, story: Dict):
-        """Render a story card"""
-        companies = story.get('companies', [])
-        if isinstance(companies, str):
-            companies = companies.split(',') if companies else []
-        
-        # Format published date
-        pub_date = story.get('published_date', '')
-        formatted_date = self.format_singapore_time(pub_date) if pub_date else 'Date not available'
-        
-        # Extract website domain
-        url_raw = story.get('url', '#')
-        website = self.extract_domain(url_raw)
-        
-        # Escape HTML to prevent rendering of tags in content
-        headline = html.escape(story.get('headline', 'No headline available'))
-        summary = html.escape(story.get('summary', 'No summary available'))
-        why_matters = html.escape(story.get('why_matters', 'Analysis not available'))
-        url = html.escape(url_raw)
-        website_escaped = html.escape(website)
-        
-        # Build companies HTML separately
-        companies_html = ''
-        if companies and len(companies) > 0:
-            company_tags = ' '.join([f'<span class="company-tag">{html.escape(company.strip())}</span>' for company in companies[:8] if company.strip()])
-            if company_tags:
-                companies_html = f'<div style="margin-top: 0.5rem;">{company_tags}</div>'
-        
-        severity = story.get('severity', 0)
-        sev_badge = ''
-        if severity and severity >= 1:
-            sev_color_map = {5: '#d32f2f', 4: '#f57c00', 3: '#fbc02d', 2: '#42a5f5', 1: '#90a4ae'}
-            sev_label_map = {5: 'CRITICAL', 4: 'HIGH', 3: 'MEDIUM', 2: 'LOW', 1: 'INFO'}
-            sev_badge = f'<span style="background:{sev_color_map.get(severity,"#90a4ae")};color:#fff;padding:2px 8px;border-radius:10px;font-size:0.75rem;font-weight:bold;margin-right:8px">{sev_label_map.get(severity,"")}</span>'
-            border_color = sev_color_map.get(severity, '#64b5f6')
-        else:
-            border_color = '#64b5f6'
-
-        st.markdown(f"""<div class="story-card" style="border-left-color: {border_color};">
-    <div class="story-headline">
-        {sev_badge}<a href="{url}" target="_blank" style="text-decoration: none; color: #90caf9;">{headline}</a>
-    </div>
-    <div style="color: #b0b0b0; font-size: 0.9rem; margin-bottom: 0.8rem;">
-        📅 {formatted_date} • 🌐 <a href="{url}" target="_blank" style="color: #64b5f6; text-decoration: none;">{website_escaped}</a>
-    </div>
-    <div class="story-summary">{summary}</div>
-    <div class="why-matters"><strong>💡 Why it matters:</strong> {why_matters}</div>{companies_html}
-</div>""", unsafe_allow_html=True)
+    def render_category(self, category: str, category_stories: List[Dict], total: int):
+        """Render one collapsible category section (total counts the category's stories across all pages)"""
+        emoji = '🟢'
+        count = total if len(category_stories) == total else f"{len(category_stories)} of {total}"
+        
+        with st.expander(f"{emoji} {category} ({count})", expanded=True):
+            # One markdown element per section rather than one per card
+            cards_html = '\n\n'.join(_story_card_html(story) for story in category_stories)
+            st.markdown(cards_html, unsafe_allow_html=True)
     
     def render_date_selector(self) -> str:
         """Render date selector and return selected date"""
@@ -330,9 +535,10 @@ class HistoryTechBriefApp:
     def format_date_display(self, date_str: str) -> str:
         """Format date for display"""
         try:
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+            # Dates come from validated YYYY-MM-DD filenames, so the C-level
+            # ISO parser is enough (strptime is far slower)
+            date_date = datetime.fromisoformat(date_str).date()
             today = datetime.now().date()
-            date_date = date_obj.date()
             
             if date_date == today:
                 return "Today"
@@ -369,6 +575,7 @@ class HistoryTechBriefApp:
             # Manual refresh
             if st.button("🔄 Refresh Data", use_container_width=True):
                 st.cache_data.clear()
+                _load_json.cache_clear()
                 st.rerun()
         
         # Load data for selected date
@@ -429,7 +636,7 @@ class HistoryTechBriefApp:
         # Generated time section - prioritize generated_at over metadata last_update
         last_update = data.get('generated_at', '') or data.get('saved_at', '') or metadata.get('last_update', '')
         if last_update:
-            time_str = self.format_singapore_time(last_update, short_format=True)
+            time_str = _format_singapore_time(last_update, short_format=True)
         else:
             time_str = 'Unknown'
         
@@ -503,28 +710,16 @@ class HistoryTechBriefApp:
                 selected_severity = 'All'
             else:
                 # Count stories per severity level
-                sev_counts = {5: 0, 4: 0, 3: 0, 2: 0, 1: 0, 0: 0}
-                for story in stories:
-                    sev = story.get('severity', 0)
-                    if sev in sev_counts:
-                        sev_counts[sev] += 1
+                counted = Counter(story.get('severity', 0) for story in stories)
+                sev_counts = {sev: counted[sev] for sev in (5, 4, 3, 2, 1, 0)}
                 
-                sev_labels = {5: 'CRITICAL', 4: 'HIGH', 3: 'MEDIUM', 2: 'LOW', 1: 'INFO', 0: 'UNSCORED'}
-                sev_display = {
-                    5: '🔴 CRITICAL',
-                    4: '🟠 HIGH',
-                    3: '🟡 MEDIUM',
-                    2: '🔵 LOW',
-                    1: '⚪ INFO',
-                    0: '⚫ UNSCORED'
-                }
                 sev_order = [5, 4, 3, 2, 1]
                 
                 cols = st.columns(5)
                 for idx, sev in enumerate(sev_order):
                     with cols[idx]:
                         if st.button(
-                            f"{sev_display[sev]} ({sev_counts[sev]})",
+                            f"{SEVERITY_DISPLAY[sev]} ({sev_counts[sev]})",
                             use_container_width=True,
                             key=f"sev_{sev}"
                         ):
@@ -534,7 +729,7 @@ class HistoryTechBriefApp:
                 with extra_cols[0]:
                     if sev_counts[0] > 0:
                         if st.button(
-                            f"{sev_display[0]} ({sev_counts[0]})",
+                            f"{SEVERITY_DISPLAY[0]} ({sev_counts[0]})",
                             use_container_width=True,
                             key="sev_0"
                         ):
@@ -545,7 +740,7 @@ class HistoryTechBriefApp:
                     st.caption(f"Showing: All Severities ({len(stories)})")
                 else:
                     st.caption(
-                        f"Showing: {sev_labels.get(selected_severity, 'Unknown')} "
+                        f"Showing: {SEVERITY_LABELS.get(selected_severity, 'Unknown')} "
                         f"({sev_counts.get(selected_severity, 0)})"
                     )
 
@@ -553,105 +748,24 @@ class HistoryTechBriefApp:
             available_dates = self.get_available_dates()
             if len(available_dates) < 2:
                 st.info("Trend charts require at least 2 days of history. Keep running the workflow!")
+            # Opt-in: the charts (and the plotly import) are only built when switched on
+            elif not st.toggle("Show trend charts", key="show_trends",
+                               help="Story totals, categories and severity across the available days"):
+                st.caption(f"Trend charts available for {len(available_dates)} days of history.")
             else:
-                import plotly.graph_objects as go
-                import plotly.express as px
-
-                trend_data = []
-                for d_str in sorted(available_dates):
-                    hist = self.load_data_for_date(d_str)
-                    if not hist:
-                        continue
-                    hist_stories = hist.get('stories', [])
-                    cat_counts_hist = {}
-                    sev_counts_hist = {5: 0, 4: 0, 3: 0, 2: 0, 1: 0}
-                    for s in hist_stories:
-                        cat = s.get('category', 'Other')
-                        cat_counts_hist[cat] = cat_counts_hist.get(cat, 0) + 1
-                        sv = s.get('severity', 3)
-                        if sv in sev_counts_hist:
-                            sev_counts_hist[sv] += 1
-                    trend_data.append({
-                        'date': d_str,
-                        'total': len(hist_stories),
-                        'categories': cat_counts_hist,
-                        'severity': sev_counts_hist
-                    })
-
-                if trend_data:
-                    dates = [t['date'] for t in trend_data]
-                    totals = [t['total'] for t in trend_data]
-
-                    # Total stories over time
-                    fig_total = go.Figure()
-                    fig_total.add_trace(go.Scatter(
-                        x=dates, y=totals, mode='lines+markers',
-                        line=dict(color='#64b5f6', width=3),
-                        marker=dict(size=8), name='Total Stories'
-                    ))
-                    fig_total.update_layout(
-                        title='Daily Story Volume', height=300,
-                        paper_bgcolor='#0e1117', plot_bgcolor='#1a1a2e',
-                        font_color='#e0e0e0', xaxis_title='', yaxis_title='Stories',
-                        margin=dict(l=40, r=20, t=40, b=30)
-                    )
-                    st.plotly_chart(fig_total, use_container_width=True)
-
-                    # Category breakdown over time (top 6)
-                    all_cats_trend = set()
-                    for t in trend_data:
-                        all_cats_trend.update(t['categories'].keys())
-                    cat_totals = {c: sum(t['categories'].get(c, 0) for t in trend_data) for c in all_cats_trend}
-                    top_cats = sorted(cat_totals, key=lambda c: cat_totals[c], reverse=True)[:6]
-
-                    cat_colors = ['#d32f2f', '#f57c00', '#fbc02d', '#42a5f5', '#66bb6a', '#ab47bc']
-                    fig_cats = go.Figure()
-                    for i, cat in enumerate(top_cats):
-                        vals = [t['categories'].get(cat, 0) for t in trend_data]
-                        fig_cats.add_trace(go.Bar(
-                            x=dates, y=vals, name=cat,
-                            marker_color=cat_colors[i % len(cat_colors)]
-                        ))
-                    fig_cats.update_layout(
-                        title='Top Categories Over Time', barmode='stack', height=350,
-                        paper_bgcolor='#0e1117', plot_bgcolor='#1a1a2e',
-                        font_color='#e0e0e0', xaxis_title='', yaxis_title='Stories',
-                        margin=dict(l=40, r=20, t=40, b=30),
-                        legend=dict(orientation='h', y=-0.2)
-                    )
-                    st.plotly_chart(fig_cats, use_container_width=True)
-
-                    # Severity distribution over time
-                    any_sev = any(t['severity'].get(5, 0) + t['severity'].get(4, 0) > 0 for t in trend_data)
-                    if any_sev:
-                        sev_colors_chart = {5: '#d32f2f', 4: '#f57c00', 3: '#fbc02d', 2: '#42a5f5', 1: '#90a4ae'}
-                        sev_names = {5: 'Critical', 4: 'High', 3: 'Medium', 2: 'Low', 1: 'Info'}
-                        fig_sev = go.Figure()
-                        for sev in [5, 4, 3, 2, 1]:
-                            vals = [t['severity'].get(sev, 0) for t in trend_data]
-                            if any(v > 0 for v in vals):
-                                fig_sev.add_trace(go.Bar(
-                                    x=dates, y=vals, name=sev_names[sev],
-                                    marker_color=sev_colors_chart[sev]
-                                ))
-                        fig_sev.update_layout(
-                            title='Severity Distribution Over Time', barmode='stack', height=300,
-                            paper_bgcolor='#0e1117', plot_bgcolor='#1a1a2e',
-                            font_color='#e0e0e0', xaxis_title='', yaxis_title='Stories',
-                            margin=dict(l=40, r=20, t=40, b=30),
-                            legend=dict(orientation='h', y=-0.2)
-                        )
-                        st.plotly_chart(fig_sev, use_container_width=True)
+                trend_data = self.get_trend_data(available_dates)
+                for fig in _trend_figures(trend_data):
+                    st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("---")
         
-        # Apply filters
-        filtered_stories = stories.copy()
+        # Apply filters (the unfiltered list is only read, so it needs no copy)
+        filtered_stories = stories
         
         # Filter by severity if selected
         if 'selected_severity' in st.session_state:
             selected_sev = st.session_state['selected_severity']
-            filtered_stories = [story for story in filtered_stories if story.get('severity') == selected_sev]
+            filtered_stories = [story for story in stories if story.get('severity') == selected_sev]
         
         # Display stories
         st.subheader(f"📰 Stories ({len(filtered_stories)} of {len(stories)})")
@@ -660,21 +774,32 @@ class HistoryTechBriefApp:
             st.info(f"No stories found with current filters.")
             return
         
+        # Render one page of cards up front; the rest are added on "Load more".
+        # Start again from one page whenever the date or severity filter changes
+        page_key = (selected_date, st.session_state.get('selected_severity'))
+        if st.session_state.get('stories_page_key') != page_key:
+            st.session_state['stories_page_key'] = page_key
+            st.session_state['stories_shown'] = STORIES_PAGE_SIZE
+        shown = st.session_state['stories_shown']
+        
         # Group stories by category for better organization
         categories_with_stories = {}
-        for story in filtered_stories:
-            category = story.get('category', 'Uncategorized')
-            if category not in categories_with_stories:
-                categories_with_stories[category] = []
-            categories_with_stories[category].append(story)
+        for story in filtered_stories[:shown]:
+            categories_with_stories.setdefault(story.get('category', 'Uncategorized'), []).append(story)
         
-        # Display by category with collapsible sections
+        # Display by category with collapsible sections, labelled with the
+        # category's full count rather than just the cards on shown pages
+        category_totals = Counter(story.get('category', 'Uncategorized') for story in filtered_stories)
         for category, category_stories in categories_with_stories.items():
-            emoji = '🟢'
-            
-            with st.expander(f"{emoji} {category} ({len(category_stories)})", expanded=True):
-                for story in category_stories:
-                    self.render_story_card(story)
+            self.render_category(category, category_stories, category_totals[category])
+        
+        remaining = len(filtered_stories) - shown
+        if remaining > 0:
+            st.button(
+                f"⬇️ Load more ({remaining} remaining)",
+                use_container_width=True,
+                on_click=lambda: st.session_state.update(stories_shown=shown + STORIES_PAGE_SIZE)
+            )
 
 if __name__ == "__main__":
     app = HistoryTechBriefApp()
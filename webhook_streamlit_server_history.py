@@ -8,38 +8,107 @@ import json
 import os
 import time
 import re
+import threading
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify
+from functools import lru_cache
+from flask import Flask, request, jsonify, send_file
 from pathlib import Path
-import glob
+from urllib.parse import urlsplit, urlunsplit
 from langdetect import detect, LangDetectException
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder/decoder
+    orjson = None
+
 app = Flask(__name__)
 
 # Configuration
 HISTORY_DIR = "history"
 CURRENT_FILE = "tech_brief.json"
 MAX_HISTORY_DAYS = 7
+HISTORY_CACHE_MAX_AGE = 60  # seconds clients may reuse /api/history responses
+
+# Story URLs per history file, so unchanged files are not re-parsed on every
+# request: date -> ((file mtime_ns, size), frozenset of URLs)
+_URL_INDEX = {}
+_URL_INDEX_LOCK = threading.Lock()
+
+# Union of the indexed URL sets and their normalize_url() keys, keyed by the
+# (date, mtime_ns, size) of every file they were built from
+_SEEN_URLS = (None, frozenset(), frozenset())
+
+# YYYY-MM-DD, checked with a regex + datetime() instead of datetime.strptime
+_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})', re.ASCII)
+
+# Patterns used by sanitize_html on every text field of every story
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Query parameters that only track the click, dropped when comparing URLs
+_TRACKING_PARAM_PREFIXES = ('utm_', 'fbclid=', 'gclid=')
+
+def load_json_file(path):
+    """Read and parse a JSON file"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def dump_json_bytes(data, indent=True):
+    """Serialize data as UTF-8 JSON, indented unless indent is False"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def is_valid_date(date_str):
+    """Check that a string is a YYYY-MM-DD date"""
+    match = _DATE_RE.fullmatch(date_str)
+    if not match:
+        return False
+    try:
+        # Calendar check, so e.g. 2025-02-31 is rejected
+        datetime(int(match[1]), int(match[2]), int(match[3]))
+    except ValueError:
+        return False
+    return True
 
 def ensure_history_dir():
     """Ensure the history directory exists"""
-    Path(HISTORY_DIR).mkdir(exist_ok=True)
+    # Called on every request - stat first so the common case skips mkdir
+    if not os.path.isdir(HISTORY_DIR):
+        Path(HISTORY_DIR).mkdir(exist_ok=True)
+
+def list_history_files():
+    """List (date_str, DirEntry) for each tech_brief_<date>.json file in one directory scan"""
+    files = []
+    with os.scandir(HISTORY_DIR) as entries:
+        for entry in entries:
+            name = entry.name
+            # Filename format: tech_brief_2025-09-30.json
+            if name.startswith('tech_brief_') and name.endswith('.json'):
+                files.append((name[len('tech_brief_'):-len('.json')], entry))
+    return files
+
+def history_cutoff():
+    """Date string before which history files are out of the retention window"""
+    return (datetime.now() - timedelta(days=MAX_HISTORY_DAYS)).strftime('%Y-%m-%d')
 
 def cleanup_old_files():
     """Remove files older than MAX_HISTORY_DAYS"""
-    cutoff_date = datetime.now() - timedelta(days=MAX_HISTORY_DAYS)
-    cutoff_str = cutoff_date.strftime('%Y-%m-%d')
+    cutoff_str = history_cutoff()
     
-    pattern = os.path.join(HISTORY_DIR, "tech_brief_*.json")
     old_files = []
     
-    for file_path in glob.glob(pattern):
-        filename = os.path.basename(file_path)
-        # Extract date from filename: tech_brief_2025-09-30.json
+    for date_str, entry in list_history_files():
+        filename = entry.name
         try:
-            date_str = filename.replace('tech_brief_', '').replace('.json', '')
             if date_str < cutoff_str:
-                os.remove(file_path)
+                os.remove(entry.path)
+                with _URL_INDEX_LOCK:
+                    _URL_INDEX.pop(date_str, None)
                 old_files.append(filename)
                 print(f"🗑️ Removed old file: {filename}")
         except Exception as e:
@@ -50,57 +119,103 @@ def cleanup_old_files():
     
     return old_files
 
-def get_previously_seen_urls():
-    """Get all story URLs from previous historical files (excluding today)"""
+def story_urls(stories):
+    """Get the set of non-empty story URLs from a stories list"""
+    urls = set()
+    for story in stories:
+        url = story.get('url', '').strip()
+        if url:
+            urls.add(url)
+    return frozenset(urls)
+
+@lru_cache(maxsize=4096)
+def normalize_url(url):
+    """Comparison key for a story URL - ignores http/https, host case, trailing slash, tracking params and fragment"""
+    url = url.strip()
+    if not url:
+        return ''
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        # Malformed link (e.g. a broken IPv6 host) - compare it verbatim
+        return url
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    query = '&'.join(
+        param for param in parts.query.split('&')
+        if param and not param.startswith(_TRACKING_PARAM_PREFIXES)
+    )
+    return urlunsplit((scheme, parts.netloc.lower(), parts.path.rstrip('/') or '/', query, ''))
+
+def get_seen_url_sets():
+    """Get (story URLs, normalized URL keys) from previous historical files (excluding today)"""
     ensure_history_dir()
+    global _SEEN_URLS
     current_date = datetime.now().strftime('%Y-%m-%d')
-    pattern = os.path.join(HISTORY_DIR, "tech_brief_*.json")
-    seen_urls = set()
+    cutoff_str = history_cutoff()
+    url_sets = []
+    signature = []
     
-    for file_path in glob.glob(pattern):
-        filename = os.path.basename(file_path)
+    for date_str, entry in list_history_files():
+        filename = entry.name
         try:
-            date_str = filename.replace('tech_brief_', '').replace('.json', '')
-            
             # Skip today's file (we want to dedupe against previous days only)
-            if date_str == current_date:
+            # and, before any stat, files cleanup_old_files is due to remove
+            if date_str == current_date or date_str < cutoff_str:
                 continue
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                stories = data.get('stories', [])
-                for story in stories:
-                    url = story.get('url', '').strip()
-                    if url:
-                        seen_urls.add(url)
+            # Only re-parse files that changed since they were indexed
+            stat = entry.stat()
+            file_key = (stat.st_mtime_ns, stat.st_size)
+            indexed = _URL_INDEX.get(date_str)
+            if indexed and indexed[0] == file_key:
+                urls = indexed[1]
+            else:
+                data = load_json_file(entry.path)
+                urls = story_urls(data.get('stories', []))
+                with _URL_INDEX_LOCK:
+                    _URL_INDEX[date_str] = (file_key, urls)
+            url_sets.append(urls)
+            signature.append((date_str,) + file_key)
         except Exception as e:
             print(f"⚠️ Error reading {filename} for deduplication: {e}")
     
-    print(f"🔍 Found {len(seen_urls)} previously seen story URLs across {len(glob.glob(pattern)) - 1} historical files")
-    return seen_urls
+    signature = tuple(signature)
+    cached_signature, seen_urls, seen_keys = _SEEN_URLS
+    if signature != cached_signature:
+        seen_urls = frozenset().union(*url_sets)
+        seen_keys = frozenset(normalize_url(url) for url in seen_urls)
+        with _URL_INDEX_LOCK:
+            _SEEN_URLS = (signature, seen_urls, seen_keys)
+    print(f"🔍 Found {len(seen_urls)} previously seen story URLs across {len(url_sets)} historical files")
+    return seen_urls, seen_keys
+
+def get_previously_seen_urls():
+    """Get all story URLs from previous historical files (excluding today)"""
+    return get_seen_url_sets()[0]
 
 def sanitize_html(text):
     """Remove HTML tags from text to prevent rendering issues"""
     if not isinstance(text, str):
         return text
-    # Remove all HTML tags
-    clean_text = re.sub(r'<[^>]+>', '', text)
+    # Remove all HTML tags (plain text, the usual case, has nothing to strip)
+    if '<' in text:
+        text = _HTML_TAG_RE.sub('', text)
     # Clean up extra whitespace
-    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-    return clean_text
+    return _WHITESPACE_RE.sub(' ', text).strip()
 
-def is_english(text):
-    """Detect if text is in English"""
+@lru_cache(maxsize=2048)
+def detect_language(text):
+    """Detect the language code of text, or None if it cannot be determined"""
     if not text or not isinstance(text, str):
-        return True  # Default to True if no text to check
+        return None
     
     try:
-        # Combine multiple fields for better detection accuracy
-        detected_lang = detect(text)
-        return detected_lang == 'en'
+        return detect(text)
     except LangDetectException:
-        # If detection fails (e.g., text too short), default to True
-        return True
+        # Detection fails e.g. when the text is too short
+        return None
 
 def sanitize_story(story):
     """Sanitize all text fields in a story to remove HTML tags"""
@@ -123,29 +238,42 @@ def deduplicate_stories(data):
         return data
     
     original_count = len(data['stories'])
-    previously_seen = get_previously_seen_urls()
+    previously_seen, seen_keys = get_seen_url_sets()
     
-    # Filter out duplicates, non-English stories, and sanitize
-    new_stories = []
+    # Filter out duplicates (from previous days or repeated within this
+    # batch), then non-English stories, and sanitize
+    unseen_stories = []
+    batch_keys = set()
     duplicate_count = 0
-    non_english_count = 0
-    
+    batch_duplicate_count = 0
     for story in data['stories']:
-        url = story.get('url', '').strip()
-        if url in previously_seen:
+        key = normalize_url(story.get('url', ''))
+        if key in seen_keys:
             duplicate_count += 1
-            print(f"🔄 Skipping duplicate: {story.get('headline', 'Unknown')[:60]}...")
             continue
-        
+        if key in batch_keys:
+            batch_duplicate_count += 1
+            continue
+        if key:
+            batch_keys.add(key)
+        unseen_stories.append(story)
+    
+    if duplicate_count:
+        print(f"🔄 Skipping {duplicate_count} stories seen on previous days")
+    if batch_duplicate_count:
+        print(f"🔄 Skipping {batch_duplicate_count} stories repeated within this batch")
+    
+    new_stories = []
+    non_english_count = 0
+    
+    for story in unseen_stories:
         # Check if story is in English (combine headline + summary for better detection)
+        # Detect once and reuse the result for the log line; stories whose
+        # language cannot be detected are kept
         text_to_check = f"{story.get('headline', '')} {story.get('summary', '')}"
-        if not is_english(text_to_check):
+        detected_lang = detect_language(text_to_check)
+        if detected_lang is not None and detected_lang != 'en':
             non_english_count += 1
-            detected_lang = 'unknown'
-            try:
-                detected_lang = detect(text_to_check)
-            except:
-                pass
             print(f"🌐 Skipping non-English story ({detected_lang}): {story.get('headline', 'Unknown')[:60]}...")
             continue
         
@@ -157,23 +285,20 @@ def deduplicate_stories(data):
     data['stories'] = new_stories
     data['total_stories'] = len(new_stories)
     
-    # Update categories count if needed
-    if new_stories:
-        unique_categories = sorted(set(story.get('category', 'Uncategorized') for story in new_stories))
-        data['categories'] = unique_categories
-    else:
-        data['categories'] = []
+    # Update categories to those still present
+    data['categories'] = sorted({story.get('category', 'Uncategorized') for story in new_stories})
     
     # Add deduplication and filtering metadata
     data['deduplication'] = {
         'original_count': original_count,
         'duplicate_count': duplicate_count,
+        'batch_duplicate_count': batch_duplicate_count,
         'non_english_count': non_english_count,
         'new_stories_count': len(new_stories),
         'previously_seen_urls': len(previously_seen)
     }
     
-    print(f"✂️ Filtering: {original_count} stories → {len(new_stories)} kept ({duplicate_count} duplicates, {non_english_count} non-English removed)")
+    print(f"✂️ Filtering: {original_count} stories → {len(new_stories)} kept ({duplicate_count} duplicates, {batch_duplicate_count} repeated in batch, {non_english_count} non-English removed)")
     
     return data
 
@@ -190,16 +315,40 @@ def save_historical_file(data):
     data['file_date'] = current_date
     
     try:
-        # Save to current file (for main app)
-        with open(CURRENT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Indented for the current file, which people open to inspect; the
+        # historical copy is only read by code, so it is stored compact
+        payload = dump_json_bytes(data)
+        
+        # Save to current file (for main app). Written in place rather than
+        # replaced/hardlinked: docker-compose bind-mounts this single file, and
+        # a new inode would not be visible through the mount
+        with open(CURRENT_FILE, 'wb') as f:
+            f.write(payload)
         print(f"✅ Saved current file: {CURRENT_FILE}")
         
-        # Save to historical file
-        with open(historical_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Save to historical file via temp file + rename, so readers never
+        # see a half-written brief. Unique per process/thread, since gunicorn
+        # may handle two webhook calls at once
+        tmp_file = f"{historical_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(dump_json_bytes(data, indent=False))
+            os.replace(tmp_file, historical_file)
+        except BaseException:
+            # Don't leave the temp file behind - cleanup_old_files only
+            # matches *.json, so nothing else would ever remove it
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            raise
         print(f"📁 Saved historical file: {historical_file}")
         
+        # Index today's URLs directly instead of re-parsing the file later
+        with _URL_INDEX_LOCK:
+            stat = os.stat(historical_file)
+            _URL_INDEX[current_date] = ((stat.st_mtime_ns, stat.st_size), story_urls(data.get('stories', [])))
+        
         # Cleanup old files
         cleanup_old_files()
         
@@ -212,16 +361,7 @@ def save_historical_file(data):
 def get_available_dates():
     """Get list of available historical dates"""
     ensure_history_dir()
-    pattern = os.path.join(HISTORY_DIR, "tech_brief_*.json")
-    dates = []
-    
-    for file_path in glob.glob(pattern):
-        filename = os.path.basename(file_path)
-        try:
-            date_str = filename.replace('tech_brief_', '').replace('.json', '')
-            dates.append(date_str)
-        except:
-            continue
+    dates = [date_str for date_str, _ in list_history_files() if is_valid_date(date_str)]
     
     # Sort dates in descending order (newest first)
     dates.sort(reverse=True)
@@ -252,7 +392,7 @@ def receive_tech_brief():
                 "message": "Data saved successfully",
                 "stories": data.get('total_stories', 0),
                 "original_stories": dedup_info.get('original_count', 0),
-                "duplicates_removed": dedup_info.get('duplicate_count', 0),
+                "duplicates_removed": dedup_info.get('duplicate_count', 0) + dedup_info.get('batch_duplicate_count', 0),
                 "timestamp": datetime.now().isoformat(),
                 "file_date": data.get('file_date', 'Unknown')
             })
@@ -268,11 +408,14 @@ def get_history():
     """Get list of available historical dates"""
     try:
         dates = get_available_dates()
-        return jsonify({
+        response = jsonify({
             "available_dates": dates,
             "total_days": len(dates),
             "max_history_days": MAX_HISTORY_DAYS
         })
+        response.add_etag()
+        response.cache_control.max_age = HISTORY_CACHE_MAX_AGE
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -280,21 +423,27 @@ def get_history():
 def get_historical_data(date):
     """Get data for a specific historical date"""
     try:
-        # Validate date format
-        datetime.strptime(date, '%Y-%m-%d')
+        # Validate date format (also keeps the path inside HISTORY_DIR)
+        if not is_valid_date(date):
+            return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
         
         historical_file = os.path.join(HISTORY_DIR, f"tech_brief_{date}.json")
         
-        if not os.path.exists(historical_file):
+        try:
+            stat = os.stat(historical_file)
+        except FileNotFoundError:
             return jsonify({"error": f"No data found for date {date}"}), 404
         
-        with open(historical_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # The stored file is already JSON - stream it as-is; conditional
+        # requests are answered from the stat-based ETag without reading it
+        return send_file(
+            os.path.abspath(historical_file),
+            mimetype='application/json',
+            etag=f"{stat.st_mtime_ns}-{stat.st_size}",
+            max_age=HISTORY_CACHE_MAX_AGE,
+            conditional=True
+        )
         
-        return jsonify(data)
-        
-    except ValueError:
-        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -323,6 +472,19 @@ def health_check():
         "available_dates": len(get_available_dates())
     })
 
+def init_history():
+    """Prepare the history directory at server start"""
+    # Ensure history directory exists
+    ensure_history_dir()
+    
+    # Initial cleanup
+    cleanup_old_files()
+
+def create_app():
+    """WSGI entry point: gunicorn 'webhook_streamlit_server_history:create_app()'"""
+    init_history()
+    return app
+
 if __name__ == '__main__':
     print("🚀 Starting n8n Streamlit Webhook Server with History Support")
     print(f"📁 History directory: {HISTORY_DIR}")
@@ -332,10 +494,8 @@ if __name__ == '__main__':
     print("📊 History API: http://localhost:8080/api/history")
     print("🔍 Health check: http://localhost:8080/health")
     
-    # Ensure history directory exists
-    ensure_history_dir()
-    
-    # Initial cleanup
-    cleanup_old_files()
+    init_history()
     
-    app.run(host='0.0.0.0', port=8080, debug=True)
+    # Development server only - the container runs gunicorn via create_app().
+    # The debugger and reloader are opt-in with FLASK_DEBUG=1.
+    app.run(host='0.0.0.0', port=8080, debug=os.environ.get('FLASK_DEBUG') == '1')